@@ -1,11 +1,42 @@
 from dataclasses import dataclass
+from datetime import timedelta
 from typing import Final
 from homeassistant.core import HomeAssistant
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.config_entries import (
+	ConfigEntry,
+	ConfigEntryState,
+)
+from homeassistant.const import (
+	CONF_ID,
+	CONF_SCAN_INTERVAL,
+	Platform,
+)
+from .analytics import SorelConnectAnalytics
+from .const import (
+	ADAPTIVE_POLLING_SLOWDOWN,
+	ADAPTIVE_POLLING_SPEEDUP,
+	ANALYTICS_WINDOW,
+	CONF_ADAPTIVE_POLLING,
+	CONF_ENERGY_STATISTICS,
+	CONF_REQUEST_BUDGET,
+	CONF_TEMPERATURE_DELTAS,
+	DEFAULT_ADAPTIVE_POLLING,
+	DEFAULT_ENERGY_STATISTICS,
+	DEFAULT_REQUEST_BUDGET,
+	DEFAULT_SCAN_INTERVAL,
+	DEFAULT_TEMPERATURE_DELTAS,
+	DOMAIN,
+	LOGGER,
+	MIN_SCAN_INTERVAL,
+)
+from .hub import async_release_state_writer
+from .periods import SorelConnectPeriods
+from .polling import SorelConnectAdaptivePolling
+from .statistics import SorelConnectEnergyStatistics
 from .sorel_connect import (
 	SorelConnectClient,
 	SorelConnectCoordinator,
+	SorelConnectEntityType,
 )
 
 
@@ -13,6 +44,9 @@ from .sorel_connect import (
 class SorelConnectConfigEntryData:
 	client: SorelConnectClient
 	coordinator: SorelConnectCoordinator
+	analytics: SorelConnectAnalytics
+	periods: SorelConnectPeriods
+	energy_statistics: SorelConnectEnergyStatistics | None
 
 
 type SorelConnectConfigEntry = ConfigEntry[SorelConnectConfigEntryData]
@@ -25,18 +59,76 @@ PLATFORMS: Final = [
 
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: SorelConnectConfigEntry) -> bool:
-	client = SorelConnectClient(hass, dict(config_entry.data))
+	client = SorelConnectClient(hass, dict(config_entry.data), dict(config_entry.options))
 	await client.initialize()
 
-	coordinator = SorelConnectCoordinator(hass, client)
+	update_interval = timedelta(seconds=config_entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+	polling = None
+
+	if config_entry.options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING):
+		min_interval = max(update_interval / ADAPTIVE_POLLING_SPEEDUP, timedelta(seconds=MIN_SCAN_INTERVAL))
+		budget = config_entry.options.get(CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET)
+
+		if budget == 0:
+			budget = int(len(client.channel_ids) * timedelta(hours=1) / update_interval)
+
+		polling = SorelConnectAdaptivePolling(
+			client.channel_ids,
+			update_interval,
+			min_interval,
+			update_interval * ADAPTIVE_POLLING_SLOWDOWN,
+			budget,
+		)
+		update_interval = min_interval
+
+	analytics = SorelConnectAnalytics(
+		client,
+		dict(config_entry.data),
+		max(1, round(timedelta(seconds=ANALYTICS_WINDOW) / update_interval)),
+		config_entry.options.get(CONF_TEMPERATURE_DELTAS, DEFAULT_TEMPERATURE_DELTAS),
+	)
+
+	coordinator = SorelConnectCoordinator(hass, client, analytics, update_interval, polling)
 	await coordinator.async_config_entry_first_refresh()
 
-	config_entry.runtime_data = SorelConnectConfigEntryData(client, coordinator)
+	periods = SorelConnectPeriods(hass, coordinator.async_update_all_listeners, coordinator.async_refresh_energy)
+	if SorelConnectEntityType.ENERGY in client.entities:
+		periods.async_start()
+		config_entry.async_on_unload(periods.async_stop)
+
+	energy_statistics = None
+	if (
+		config_entry.options.get(CONF_ENERGY_STATISTICS, DEFAULT_ENERGY_STATISTICS)
+		and SorelConnectEntityType.ENERGY in client.entities
+	):
+		if "recorder" not in hass.config.components:
+			LOGGER.warning("Recorder is not loaded, energy is provided as sensors instead of long-term statistics")
+		else:
+			energy_statistics = SorelConnectEnergyStatistics(hass, coordinator, periods, config_entry.data[CONF_ID], client.entities[SorelConnectEntityType.ENERGY])
+			await energy_statistics.async_start()
+			config_entry.async_on_unload(energy_statistics.async_stop)
+
+	config_entry.runtime_data = SorelConnectConfigEntryData(client, coordinator, analytics, periods, energy_statistics)
 
 	await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
+	config_entry.async_on_unload(config_entry.add_update_listener(async_reload_entry))
+
 	return True
 
 
+async def async_reload_entry(hass: HomeAssistant, config_entry: SorelConnectConfigEntry) -> None:
+	await hass.config_entries.async_reload(config_entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, config_entry: SorelConnectConfigEntry) -> bool:
-	return await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
+	unloaded = await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
+
+	if unloaded:
+		other_loaded_entries = [
+			entry for entry in hass.config_entries.async_entries(DOMAIN)
+			if entry.entry_id != config_entry.entry_id and entry.state is ConfigEntryState.LOADED
+		]
+		async_release_state_writer(hass, config_entry.runtime_data.coordinator, len(other_loaded_entries) == 0)
+
+	return unloaded
@@ -0,0 +1,109 @@
+"""Derived values computed from the SOREL Connect data."""
+from __future__ import annotations
+from collections import deque
+from homeassistant.const import (
+	CONF_ID,
+	STATE_ON,
+)
+from homeassistant.helpers.typing import StateType
+from typing import Any, Deque, Dict, List, Tuple
+from .sorel_connect import (
+	SorelConnectClient,
+	SorelConnectEntity,
+	SorelConnectEntityType,
+)
+
+
+class SorelConnectRingBuffer:
+	"""Fixed-size buffer keeping a running sum so the mean costs O(1) per sample."""
+
+	def __init__(self, size: int) -> None:
+		self._values: Deque[float] = deque(maxlen=size)
+		self._sum: float = 0.0
+
+	def append(self, value: float) -> None:
+		if len(self._values) == self._values.maxlen:
+			self._sum -= self._values[0]
+
+		self._values.append(value)
+		self._sum += value
+
+	@property
+	def mean(self) -> float | None:
+		if len(self._values) == 0:
+			return None
+
+		return self._sum / len(self._values)
+
+
+class SorelConnectAnalytics:
+
+	def __init__(self, client: SorelConnectClient, config: Dict[str, Any], window_size: int, temperature_deltas: List[Tuple[int, int]]) -> None:
+		self._config: Dict[str, Any] = config
+
+		self._duty_cycles: Dict[str, Tuple[str, SorelConnectRingBuffer]] = {}
+		self._power_means: Dict[str, Tuple[str, SorelConnectRingBuffer]] = {}
+		self._temperature_deltas: Dict[str, Tuple[str, str]] = {}
+
+		self.entities: Dict[SorelConnectEntityType, Dict[str, SorelConnectEntity]] = {}
+		self.values: Dict[str, StateType] = {}
+
+		for relay in client.entities.get(SorelConnectEntityType.ON_OFF, {}).values():
+			entity = self._create_entity(SorelConnectEntityType.DUTY_CYCLE, "{}_duty_cycle".format(relay.id), "{} duty cycle".format(relay.name))
+			self._duty_cycles[entity.id] = (relay.id, SorelConnectRingBuffer(window_size))
+
+		for power_sensor in client.entities.get(SorelConnectEntityType.POWER, {}).values():
+			entity = self._create_entity(SorelConnectEntityType.MEAN_POWER, "{}_mean".format(power_sensor.id), "{} mean".format(power_sensor.name))
+			self._power_means[entity.id] = (power_sensor.id, SorelConnectRingBuffer(window_size))
+
+		temperature_sensors = client.entities.get(SorelConnectEntityType.TEMPERATURE, {})
+		for hot_sensor_id, cold_sensor_id in temperature_deltas:
+			hot_sensor = temperature_sensors.get(client.get_entity_sensor_id(hot_sensor_id))
+			cold_sensor = temperature_sensors.get(client.get_entity_sensor_id(cold_sensor_id))
+
+			if hot_sensor is None or cold_sensor is None:
+				continue
+
+			entity = self._create_entity(
+				SorelConnectEntityType.TEMPERATURE_DELTA,
+				"{}_{}_delta".format(hot_sensor.id, cold_sensor.id),
+				"{} - {} difference".format(hot_sensor.name, cold_sensor.name),
+			)
+			self._temperature_deltas[entity.id] = (hot_sensor.id, cold_sensor.id)
+
+	def update(self, data: Dict[str, StateType]) -> None:
+		# Called on every coordinator tick, values of channels not polled in this tick are held,
+		# so every sample covers the same time whether the polling is adaptive or not
+		for entity_id, (relay_id, buffer) in self._duty_cycles.items():
+			if data.get(relay_id) is not None:
+				buffer.append(1.0 if data[relay_id] == STATE_ON else 0.0)
+
+			self.values[entity_id] = None if buffer.mean is None else round(buffer.mean * 100, 1)
+
+		for entity_id, (power_sensor_id, buffer) in self._power_means.items():
+			if data.get(power_sensor_id) is not None:
+				buffer.append(data[power_sensor_id])
+
+			self.values[entity_id] = buffer.mean
+
+		for entity_id, (hot_sensor_id, cold_sensor_id) in self._temperature_deltas.items():
+			hot_value = data.get(hot_sensor_id)
+			cold_value = data.get(cold_sensor_id)
+
+			self.values[entity_id] = None if hot_value is None or cold_value is None else hot_value - cold_value
+
+	def _create_entity(self, entity_type: SorelConnectEntityType, entity_id: str, entity_name: str) -> SorelConnectEntity:
+		entity = SorelConnectEntity(
+			"{}.{}".format(self._config[CONF_ID], entity_id),
+			entity_type,
+			entity_id,
+			entity_name,
+		)
+
+		if entity_type not in self.entities:
+			self.entities[entity_type] = {}
+
+		self.entities[entity_type][entity.id] = entity
+		self.values[entity.id] = None
+
+		return entity
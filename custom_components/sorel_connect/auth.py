@@ -0,0 +1,111 @@
+"""Session handling for the SOREL Connect component."""
+from __future__ import annotations
+import aiohttp
+import asyncio
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+from json import JSONDecodeError, loads as json_load
+from typing import Final
+from .errors import (
+	InvalidCredentials,
+	ServiceUnavailable,
+	SorelConnectException,
+)
+
+EXPIRED_SESSION_STATUSES: Final = (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN)
+
+# Login responses carry the session so no cache between us and the controller may keep them
+LOGIN_HEADERS: Final = {
+	"Cache-Control": "no-store",
+	"Pragma": "no-cache",
+}
+
+REDACTED: Final = "**REDACTED**"
+
+
+class SorelConnectAuth:
+
+	def __init__(self, session: aiohttp.ClientSession, host: str, email: str, password: str, timeout: aiohttp.ClientTimeout) -> None:
+		self._session: aiohttp.ClientSession = session
+		self._host: str = host
+		self._email: str = email
+		self._password: str = password
+		self._timeout: aiohttp.ClientTimeout = timeout
+
+		self._lock: asyncio.Lock = asyncio.Lock()
+		self.cookies: SimpleCookie | None = None
+		# Increased with every login so requests can tell whether their session was already replaced
+		self.generation: int = 0
+		# Login attempts and the failure of the last one, so requests sent before it do not try again
+		self.attempts: int = 0
+		self._failure: SorelConnectException | None = None
+
+	async def ensure_session(self) -> None:
+		if self.cookies is not None:
+			return
+
+		await self.reauthenticate(self.generation, self.attempts)
+
+	async def reauthenticate(self, generation: int, attempts: int) -> None:
+		async with self._lock:
+			if generation != self.generation and self.cookies is not None:
+				# Another request has already logged in again
+				return
+
+			if attempts != self.attempts and self._failure is not None:
+				# Another request has just failed to log in
+				raise self._failure
+
+			self.cookies = None
+			self.attempts += 1
+
+			try:
+				await self._login()
+			except SorelConnectException as ex:
+				self._failure = ex
+				raise
+
+			self._failure = None
+
+	@staticmethod
+	def is_expired(response: aiohttp.ClientResponse) -> bool:
+		# An expired session is redirected to the login page or refused
+		return response.status in EXPIRED_SESSION_STATUSES or len(response.history) > 0
+
+	def redact(self, text: str) -> str:
+		for secret in (self._password, self._email):
+			if secret:
+				text = text.replace(secret, REDACTED)
+
+		return text
+
+	async def _login(self) -> None:
+		try:
+			response = await self._session.get(
+				"https://{}/nabto/hosted_plugin/login/execute".format(self._host),
+				params={
+					"email": self._email,
+					"password": self._password,
+				},
+				headers=LOGIN_HEADERS,
+				verify_ssl=False,
+				timeout=self._timeout,
+			)
+			data = await response.text()
+		except (aiohttp.ClientError, TimeoutError):
+			# The exception contains the request URL including the credentials
+			raise ServiceUnavailable from None
+
+		if response.status != HTTPStatus.OK:
+			raise ServiceUnavailable
+
+		try:
+			json = json_load(data.strip('()'))
+		except JSONDecodeError:
+			raise ServiceUnavailable from None
+
+		if "session_key" not in json:
+			raise InvalidCredentials
+
+		self.cookies = response.cookies
+		self.generation += 1
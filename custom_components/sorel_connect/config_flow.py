@@ -1,15 +1,43 @@
 from __future__ import annotations
-from homeassistant.config_entries import ConfigFlow
+from homeassistant.config_entries import (
+	ConfigEntry,
+	ConfigFlow,
+	OptionsFlow,
+)
 from homeassistant.const import (
 	CONF_ID,
 	CONF_EMAIL,
 	CONF_PASSWORD,
+	CONF_SCAN_INTERVAL,
+	CONF_TIMEOUT,
 )
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import AbortFlow
-from typing import Any, Dict
+import homeassistant.helpers.config_validation as cv
+import re
+from typing import Any, Dict, List
 import voluptuous as vol
 from .const import (
+	CONF_ADAPTIVE_POLLING,
+	CONF_DISABLED_CHANNELS,
+	CONF_DISABLED_GROUPS,
+	CONF_ENERGY_STATISTICS,
+	CONF_REQUEST_BUDGET,
+	CONF_REQUEST_CONCURRENCY,
+	CONF_TEMPERATURE_DELTAS,
+	DEFAULT_ADAPTIVE_POLLING,
+	DEFAULT_ENERGY_STATISTICS,
+	DEFAULT_REQUEST_BUDGET,
+	DEFAULT_REQUEST_CONCURRENCY,
+	DEFAULT_SCAN_INTERVAL,
+	DEFAULT_TEMPERATURE_DELTAS,
+	DEFAULT_TIMEOUT,
 	DOMAIN,
+	MAX_REQUEST_CONCURRENCY,
+	MAX_SENSORS,
+	MAX_TIMEOUT,
+	MIN_SCAN_INTERVAL,
+	MIN_TIMEOUT,
 	NAME,
 	LOGGER,
 )
@@ -17,10 +45,19 @@ from .errors import (
 	InvalidCredentials,
 	ServiceUnavailable,
 )
-from .sorel_connect import SorelConnectClient
+from .sorel_connect import (
+	SorelConnectChannelGroup,
+	SorelConnectClient,
+)
 
 
 class SorelConnectConfigFlow(ConfigFlow, domain=DOMAIN):
+
+	@staticmethod
+	@callback
+	def async_get_options_flow(config_entry: ConfigEntry) -> SorelConnectOptionsFlow:
+		return SorelConnectOptionsFlow()
+
 	async def async_step_user(self, user_input: Dict[str, Any] | None = None) -> Dict[str, Any]:
 		errors = {}
 
@@ -61,3 +98,62 @@ class SorelConnectConfigFlow(ConfigFlow, domain=DOMAIN):
 			),
 			errors=errors,
 		)
+
+
+class SorelConnectOptionsFlow(OptionsFlow):
+	async def async_step_init(self, user_input: Dict[str, Any] | None = None) -> Dict[str, Any]:
+		errors = {}
+
+		if user_input is not None:
+			temperature_deltas = self._parse_temperature_deltas(user_input[CONF_TEMPERATURE_DELTAS])
+
+			if temperature_deltas is None:
+				errors[CONF_TEMPERATURE_DELTAS] = "invalid_temperature_deltas"
+			else:
+				return self.async_create_entry(data={**user_input, CONF_TEMPERATURE_DELTAS: temperature_deltas})
+
+		options = self.config_entry.options
+
+		return self.async_show_form(
+			step_id="init",
+			data_schema=vol.Schema(
+				{
+					vol.Required(CONF_SCAN_INTERVAL, default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL)),
+					vol.Required(CONF_ADAPTIVE_POLLING, default=options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)): bool,
+					vol.Required(CONF_REQUEST_BUDGET, default=options.get(CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET)): vol.All(vol.Coerce(int), vol.Range(min=0)),
+					vol.Required(CONF_REQUEST_CONCURRENCY, default=options.get(CONF_REQUEST_CONCURRENCY, DEFAULT_REQUEST_CONCURRENCY)): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_REQUEST_CONCURRENCY)),
+					vol.Required(CONF_TIMEOUT, default=options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)): vol.All(vol.Coerce(int), vol.Range(min=MIN_TIMEOUT, max=MAX_TIMEOUT)),
+					vol.Required(CONF_ENERGY_STATISTICS, default=options.get(CONF_ENERGY_STATISTICS, DEFAULT_ENERGY_STATISTICS)): bool,
+					vol.Optional(CONF_DISABLED_GROUPS, default=options.get(CONF_DISABLED_GROUPS, [])): cv.multi_select({group.value: group.value.capitalize() for group in SorelConnectChannelGroup}),
+					vol.Optional(CONF_DISABLED_CHANNELS, default=options.get(CONF_DISABLED_CHANNELS, [])): cv.multi_select(SorelConnectClient.get_all_channels()),
+					vol.Optional(CONF_TEMPERATURE_DELTAS, default=self._format_temperature_deltas(options.get(CONF_TEMPERATURE_DELTAS, DEFAULT_TEMPERATURE_DELTAS))): str,
+				}
+			),
+			errors=errors,
+		)
+
+	@staticmethod
+	def _format_temperature_deltas(temperature_deltas: List[List[int]]) -> str:
+		return ", ".join("{}-{}".format(hot_sensor_id, cold_sensor_id) for hot_sensor_id, cold_sensor_id in temperature_deltas)
+
+	@staticmethod
+	def _parse_temperature_deltas(value: str) -> List[List[int]] | None:
+		temperature_deltas = []
+
+		for pair in value.split(","):
+			if pair.strip() == "":
+				continue
+
+			match = re.match("^(\\d+)-(\\d+)$", pair.strip())
+			if match is None:
+				return None
+
+			hot_sensor_id = int(match.group(1))
+			cold_sensor_id = int(match.group(2))
+
+			if not (1 <= hot_sensor_id <= MAX_SENSORS and 1 <= cold_sensor_id <= MAX_SENSORS) or hot_sensor_id == cold_sensor_id:
+				return None
+
+			temperature_deltas.append([hot_sensor_id, cold_sensor_id])
+
+		return temperature_deltas
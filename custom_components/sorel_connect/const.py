@@ -19,3 +19,34 @@ DEVICE_INFO: Final = DeviceInfo(
 
 MAX_SENSORS = 10
 MAX_RELAYS = 5
+
+CONF_REQUEST_CONCURRENCY = "request_concurrency"
+CONF_DISABLED_GROUPS = "disabled_groups"
+CONF_DISABLED_CHANNELS = "disabled_channels"
+CONF_TEMPERATURE_DELTAS = "temperature_deltas"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_REQUEST_BUDGET = "request_budget"
+CONF_ENERGY_STATISTICS = "energy_statistics"
+
+DEFAULT_SCAN_INTERVAL = 300
+DEFAULT_REQUEST_CONCURRENCY = 1
+DEFAULT_TIMEOUT = 30
+DEFAULT_ADAPTIVE_POLLING = False
+# Zero means the same number of requests as the fixed polling
+DEFAULT_REQUEST_BUDGET = 0
+DEFAULT_ENERGY_STATISTICS = False
+
+MIN_SCAN_INTERVAL = 60
+MAX_REQUEST_CONCURRENCY = 10
+MIN_TIMEOUT = 5
+MAX_TIMEOUT = 120
+
+# Adaptive polling ranges from the update interval divided by the speedup to the update interval multiplied by the slowdown
+ADAPTIVE_POLLING_SPEEDUP = 4
+ADAPTIVE_POLLING_SLOWDOWN = 6
+
+# Collector and storage sensors of the common solar controllers
+DEFAULT_TEMPERATURE_DELTAS = [(1, 2)]
+
+# Seconds covered by the derived values, the number of samples follows from the coordinator interval
+ANALYTICS_WINDOW = 3600
@@ -1,14 +1,20 @@
 from __future__ import annotations
 from homeassistant.components.diagnostics import async_redact_data
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_PASSWORD
+from homeassistant.const import (
+	CONF_EMAIL,
+	CONF_PASSWORD,
+)
 from homeassistant.core import HomeAssistant
+from . import SorelConnectConfigEntry
 
 
 async def async_get_config_entry_diagnostics(
-	hass: HomeAssistant, config_entry: ConfigEntry
+	hass: HomeAssistant, config_entry: SorelConnectConfigEntry
 ) -> dict:
+	polling = config_entry.runtime_data.coordinator.polling
 
 	return {
-		"configuration": async_redact_data(config_entry.data, CONF_PASSWORD),
+		"configuration": async_redact_data(config_entry.data, {CONF_EMAIL, CONF_PASSWORD}),
+		"options": dict(config_entry.options),
+		"polling": polling.as_dict(hass.loop.time()) if polling is not None else None,
 	}
@@ -0,0 +1,79 @@
+"""Batched state writes shared by all SOREL Connect controllers."""
+from __future__ import annotations
+from datetime import datetime
+from homeassistant.core import callback, CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+from typing import Dict, Final, TYPE_CHECKING
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+	from .sorel_connect import SorelConnectCoordinator
+
+STATE_WRITER_KEY: Final = "state_writer"
+
+# Refreshes finishing within this window are written together
+STATE_WRITE_BATCH_WINDOW: Final = 0.5
+
+
+class SorelConnectStateWriter:
+
+	def __init__(self, hass: HomeAssistant) -> None:
+		self._hass: HomeAssistant = hass
+
+		self._pending: Dict[SorelConnectCoordinator, bool] = {}
+		self._unsub_flush: CALLBACK_TYPE | None = None
+
+	@callback
+	def async_schedule(self, coordinator: SorelConnectCoordinator, force: bool = False) -> None:
+		# A newer refresh of the same coordinator supersedes the pending one
+		self._pending[coordinator] = self._pending.get(coordinator, False) or force
+
+		if self._unsub_flush is None:
+			self._unsub_flush = async_call_later(self._hass, STATE_WRITE_BATCH_WINDOW, self._async_flush)
+
+	@callback
+	def async_remove(self, coordinator: SorelConnectCoordinator) -> None:
+		self._pending.pop(coordinator, None)
+
+		if len(self._pending) == 0:
+			self.async_stop()
+
+	@callback
+	def async_stop(self) -> None:
+		if self._unsub_flush is not None:
+			self._unsub_flush()
+			self._unsub_flush = None
+
+	@callback
+	def _async_flush(self, _now: datetime) -> None:
+		self._unsub_flush = None
+
+		pending = self._pending
+		self._pending = {}
+
+		for coordinator, force in pending.items():
+			coordinator.async_write_listeners(force)
+
+
+@callback
+def async_get_state_writer(hass: HomeAssistant) -> SorelConnectStateWriter:
+	data = hass.data.setdefault(DOMAIN, {})
+
+	if STATE_WRITER_KEY not in data:
+		data[STATE_WRITER_KEY] = SorelConnectStateWriter(hass)
+
+	return data[STATE_WRITER_KEY]
+
+
+@callback
+def async_release_state_writer(hass: HomeAssistant, coordinator: SorelConnectCoordinator, last_entry: bool) -> None:
+	data = hass.data.get(DOMAIN, {})
+
+	if STATE_WRITER_KEY not in data:
+		return
+
+	data[STATE_WRITER_KEY].async_remove(coordinator)
+
+	if last_entry:
+		data[STATE_WRITER_KEY].async_stop()
+		del data[STATE_WRITER_KEY]
@@ -0,0 +1,89 @@
+"""Energy period boundaries for the SOREL Connect component."""
+from __future__ import annotations
+import asyncio
+from datetime import date, datetime, timedelta
+from homeassistant.core import callback, CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import (
+	async_call_later,
+	async_track_point_in_time,
+)
+import homeassistant.util.dt as dt_util
+from typing import Any, Callable, Coroutine, Dict, Final
+from .sorel_connect import SorelConnectEnergyType
+
+# The controller needs a moment to reset its own counters after midnight
+ROLLOVER_REFRESH_DELAY: Final = timedelta(minutes=1)
+
+
+class SorelConnectPeriods:
+
+	def __init__(self, hass: HomeAssistant, on_boundary: Callable[[], None], on_refresh: Callable[[], Coroutine[Any, Any, None]]) -> None:
+		self._hass: HomeAssistant = hass
+		self._on_boundary: Callable[[], None] = on_boundary
+		self._on_refresh: Callable[[], Coroutine[Any, Any, None]] = on_refresh
+
+		self._boundaries: Dict[SorelConnectEnergyType, datetime] = {}
+		self._unsub_boundary: CALLBACK_TYPE | None = None
+		self._unsub_refresh: CALLBACK_TYPE | None = None
+		self._refresh_task: asyncio.Task | None = None
+
+	def get_last_reset(self, energy_type: SorelConnectEnergyType) -> datetime | None:
+		return self._boundaries.get(energy_type)
+
+	@callback
+	def async_start(self) -> None:
+		self._compute_boundaries()
+		self._schedule_next_boundary()
+
+	@callback
+	def async_stop(self) -> None:
+		if self._unsub_boundary is not None:
+			self._unsub_boundary()
+			self._unsub_boundary = None
+
+		if self._unsub_refresh is not None:
+			self._unsub_refresh()
+			self._unsub_refresh = None
+
+		if self._refresh_task is not None:
+			self._refresh_task.cancel()
+			self._refresh_task = None
+
+	def _compute_boundaries(self) -> None:
+		today = dt_util.now().date()
+
+		self._boundaries = {
+			SorelConnectEnergyType.DAY: dt_util.start_of_local_day(today),
+			SorelConnectEnergyType.WEEK: dt_util.start_of_local_day(today - timedelta(days=today.weekday())),
+			SorelConnectEnergyType.MONTH: dt_util.start_of_local_day(date(today.year, today.month, 1)),
+			SorelConnectEnergyType.YEAR: dt_util.start_of_local_day(date(today.year, 1, 1)),
+		}
+
+	@callback
+	def _schedule_next_boundary(self) -> None:
+		# Every longer period starts at midnight as well, so the day boundary is the only one to track
+		next_boundary = dt_util.start_of_local_day(self._boundaries[SorelConnectEnergyType.DAY].date() + timedelta(days=1))
+
+		self._unsub_boundary = async_track_point_in_time(self._hass, self._handle_boundary, next_boundary)
+
+	@callback
+	def _handle_boundary(self, _now: datetime) -> None:
+		self._unsub_boundary = None
+
+		self._compute_boundaries()
+		self._schedule_next_boundary()
+		self._on_boundary()
+
+		if self._unsub_refresh is not None:
+			self._unsub_refresh()
+
+		self._unsub_refresh = async_call_later(self._hass, ROLLOVER_REFRESH_DELAY, self._handle_refresh)
+
+	@callback
+	def _handle_refresh(self, _now: datetime) -> None:
+		self._unsub_refresh = None
+
+		if self._refresh_task is not None and not self._refresh_task.done():
+			return
+
+		self._refresh_task = self._hass.async_create_task(self._on_refresh())
@@ -0,0 +1,99 @@
+"""Adaptive polling of the SOREL Connect channels."""
+from __future__ import annotations
+from datetime import datetime, timedelta
+from homeassistant.helpers.typing import StateType
+import homeassistant.util.dt as dt_util
+from typing import Dict, Final, Iterable, List
+
+# Channel interval is divided by this when its value changes and multiplied when it does not
+INTERVAL_DECREASE_FACTOR: Final = 2.0
+INTERVAL_INCREASE_FACTOR: Final = 1.5
+
+
+class SorelConnectChannelPolling:
+
+	def __init__(self, interval: float) -> None:
+		self.interval: float = interval
+		self.next_poll: float = 0.0
+		self.value: StateType = None
+		self.polled: bool = False
+		self.last_poll: float | None = None
+		self.previous_poll: float | None = None
+		self.last_changed: datetime | None = None
+
+
+class SorelConnectAdaptivePolling:
+
+	def __init__(self, channel_ids: Iterable[str], interval: timedelta, min_interval: timedelta, max_interval: timedelta, budget: int) -> None:
+		self._min_interval: float = min_interval.total_seconds()
+		self._max_interval: float = max_interval.total_seconds()
+
+		self._channels: Dict[str, SorelConnectChannelPolling] = {
+			channel_id: SorelConnectChannelPolling(interval.total_seconds()) for channel_id in channel_ids
+		}
+
+		# Token bucket: refilled with the hourly budget, large enough for one poll of every channel
+		self._budget: int = budget
+		self._capacity: float = float(max(len(self._channels), 1))
+		self._tokens: float = self._capacity
+		self._last_refill: float | None = None
+
+	def get_due_channels(self, now: float) -> List[str]:
+		self._refill(now)
+
+		due_channels = [channel_id for channel_id, channel in self._channels.items() if channel.next_poll <= now]
+
+		# Most overdue channels relative to their own interval go first when the budget is short
+		due_channels.sort(key=lambda channel_id: (now - self._channels[channel_id].next_poll) / self._channels[channel_id].interval, reverse=True)
+
+		due_channels = due_channels[0:int(self._tokens)]
+		self._tokens -= len(due_channels)
+
+		return due_channels
+
+	def record(self, channel_id: str, value: StateType, now: float) -> None:
+		channel = self._channels[channel_id]
+
+		if channel.polled and value != channel.value:
+			channel.interval = max(self._min_interval, channel.interval / INTERVAL_DECREASE_FACTOR)
+			channel.last_changed = dt_util.utcnow()
+		elif channel.polled:
+			channel.interval = min(self._max_interval, channel.interval * INTERVAL_INCREASE_FACTOR)
+
+		channel.value = value
+		channel.polled = True
+		channel.next_poll = now + channel.interval
+		channel.previous_poll = channel.last_poll
+		channel.last_poll = now
+
+	def as_dict(self, now: float) -> dict:
+		return {
+			"budget_per_hour": self._budget,
+			"available_requests": int(self._tokens),
+			"channels": {
+				channel_id: {
+					"interval_seconds": round(channel.interval),
+					"target_polls_per_hour": round(3600 / channel.interval, 1),
+					"effective_polls_per_hour": self._get_effective_polls_per_hour(channel, now),
+					"last_changed": channel.last_changed.isoformat() if channel.last_changed is not None else None,
+				} for channel_id, channel in self._channels.items()
+			},
+		}
+
+	@staticmethod
+	def _get_effective_polls_per_hour(channel: SorelConnectChannelPolling, now: float) -> float | None:
+		if channel.last_poll is None or channel.previous_poll is None:
+			return None
+
+		# A channel starved by the budget has been waiting longer than its last gap
+		elapsed = max(channel.last_poll - channel.previous_poll, now - channel.last_poll)
+		if elapsed <= 0:
+			return None
+
+		return round(3600 / elapsed, 1)
+
+	def _refill(self, now: float) -> None:
+		if self._last_refill is not None:
+			self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._budget / 3600)
+
+		self._last_refill = now
@@ -1,5 +1,4 @@
 from __future__ import annotations
-from datetime import date, timedelta
 from homeassistant.components.sensor import (
 	SensorDeviceClass,
 	SensorEntity,
@@ -14,6 +13,7 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from . import SorelConnectConfigEntry
+from .periods import SorelConnectPeriods
 from .sorel_connect import (
 	SorelConnectEnergyEntity,
 	SorelConnectEnergyType,
@@ -25,6 +25,8 @@ from .sorel_connect import (
 async def async_setup_entry(hass: HomeAssistant, config_entry: SorelConnectConfigEntry, async_add_entities) -> None:
 	client = config_entry.runtime_data.client
 	coordinator = config_entry.runtime_data.coordinator
+	analytics = config_entry.runtime_data.analytics
+	periods = config_entry.runtime_data.periods
 
 	entities = []
 
@@ -32,7 +34,6 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: SorelConnectConfi
 		SorelConnectEntityType.TEMPERATURE: SorelConnectTemperatureSensorEntity,
 		SorelConnectEntityType.PERCENTAGE: SorelConnectPercentageSensorEntity,
 		SorelConnectEntityType.POWER: SorelConnectPowerSensorEntity,
-		SorelConnectEntityType.ENERGY: SorelConnectEnergySensorEntity,
 	}
 
 	for entity_type, entity_class in mapping.items():
@@ -42,6 +43,24 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: SorelConnectConfi
 		for entity in client.entities[entity_type].values():
 			entities.append(entity_class(coordinator, entity))
 
+	# Energy channels fed directly into the long-term statistics have no entities
+	if SorelConnectEntityType.ENERGY in client.entities and config_entry.runtime_data.energy_statistics is None:
+		for entity in client.entities[SorelConnectEntityType.ENERGY].values():
+			entities.append(SorelConnectEnergySensorEntity(coordinator, entity, periods))
+
+	analytics_mapping = {
+		SorelConnectEntityType.DUTY_CYCLE: SorelConnectDutyCycleSensorEntity,
+		SorelConnectEntityType.MEAN_POWER: SorelConnectMeanPowerSensorEntity,
+		SorelConnectEntityType.TEMPERATURE_DELTA: SorelConnectTemperatureDeltaSensorEntity,
+	}
+
+	for entity_type, entity_class in analytics_mapping.items():
+		if entity_type not in analytics.entities:
+			continue
+
+		for entity in analytics.entities[entity_type].values():
+			entities.append(entity_class(coordinator, entity))
+
 	async_add_entities(entities)
 
 
@@ -82,7 +101,9 @@ class SorelConnectEnergySensorEntity(SorelConnectSensorEntity):
 	_attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
 	_attr_suggested_display_precision = 3
 
-	def __init__(self, coordinator: DataUpdateCoordinator, entity: SorelConnectEnergyEntity) -> None:
+	def __init__(self, coordinator: DataUpdateCoordinator, entity: SorelConnectEnergyEntity, periods: SorelConnectPeriods) -> None:
+		self._periods: SorelConnectPeriods = periods
+
 		super().__init__(coordinator, entity)
 
 		self._entity: SorelConnectEnergyEntity = entity
@@ -105,14 +126,23 @@ class SorelConnectEnergySensorEntity(SorelConnectSensorEntity):
 			value = round(value / 1000, 3)
 
 		self._attr_native_value = value
+		self._attr_last_reset = self._periods.get_last_reset(self._entity.energy_type)
+
 
-		if self._entity.energy_type == SorelConnectEnergyType.YEAR:
-			self._attr_last_reset = date(date.today().year, 1, 1)
-		elif self._entity.energy_type == SorelConnectEnergyType.MONTH:
-			today = date.today()
-			self._attr_last_reset = date(today.year, today.month, 1)
-		elif self._entity.energy_type == SorelConnectEnergyType.WEEK:
-			today = date.today()
-			self._attr_last_reset = today - timedelta(days=today.weekday())
-		elif self._entity.energy_type == SorelConnectEnergyType.DAY:
-			self._attr_last_reset = date.today()
+class SorelConnectDutyCycleSensorEntity(SorelConnectPercentageSensorEntity):
+
+	_attr_entity_registry_enabled_default = False
+	_attr_suggested_display_precision = 1
+
+
+class SorelConnectMeanPowerSensorEntity(SorelConnectPowerSensorEntity):
+
+	_attr_entity_registry_enabled_default = False
+
+
+class SorelConnectTemperatureDeltaSensorEntity(SorelConnectSensorEntity):
+
+	_attr_entity_registry_enabled_default = False
+	_attr_state_class = SensorStateClass.MEASUREMENT
+	_attr_native_unit_of_measurement = UnitOfTemperature.KELVIN
+	_attr_suggested_display_precision = 1
@@ -1,12 +1,15 @@
 from __future__ import annotations
 import aiohttp
+import asyncio
 from abc import abstractmethod
 from datetime import timedelta
 from enum import Enum, StrEnum
+from functools import partial
 from homeassistant.const import (
 	CONF_ID,
 	CONF_EMAIL,
 	CONF_PASSWORD,
+	CONF_TIMEOUT,
 	STATE_ON,
 	STATE_OFF,
 )
@@ -20,23 +23,36 @@ from homeassistant.helpers.update_coordinator import (
 	CoordinatorEntity,
 	DataUpdateCoordinator,
 )
-from json import loads as json_load
 from http import HTTPStatus
 from http.cookies import SimpleCookie
 import re
-from typing import Any, Dict, Final
+from typing import Any, Awaitable, Callable, Dict, Final, Iterable, List, TYPE_CHECKING
 from .const import (
+	CONF_DISABLED_CHANNELS,
+	CONF_DISABLED_GROUPS,
+	CONF_REQUEST_CONCURRENCY,
+	DEFAULT_REQUEST_CONCURRENCY,
+	DEFAULT_TIMEOUT,
 	DEVICE_INFO,
 	DOMAIN,
 	LOGGER,
 	MAX_RELAYS,
 	MAX_SENSORS,
 )
+from .auth import (
+	EXPIRED_SESSION_STATUSES,
+	SorelConnectAuth,
+)
+from .hub import async_get_state_writer
 from .errors import (
-	InvalidCredentials,
 	ServiceUnavailable,
+	SorelConnectException,
 )
 
+if TYPE_CHECKING:
+	from .analytics import SorelConnectAnalytics
+	from .polling import SorelConnectAdaptivePolling
+
 STORAGE_VERSION: Final = 1
 STORAGE_SENSORS_KEY: Final = "sensors"
 
@@ -47,6 +63,16 @@ class SorelConnectEntityType(StrEnum):
 	ON_OFF = "on_off"
 	POWER = "power"
 	ENERGY = "energy"
+	DUTY_CYCLE = "duty_cycle"
+	MEAN_POWER = "mean_power"
+	TEMPERATURE_DELTA = "temperature_delta"
+
+
+class SorelConnectChannelGroup(StrEnum):
+	SENSORS = "sensors"
+	POWER = "power"
+	ENERGY = "energy"
+	RELAYS = "relays"
 
 
 class SorelConnectEntity:
@@ -67,6 +93,17 @@ class SorelConnectPowerType(Enum):
 	TOTAL = 22
 
 
+POWER_TYPES: Final = (
+	SorelConnectPowerType.ACTUAL,
+	SorelConnectPowerType.DAY,
+	SorelConnectPowerType.WEEK,
+	SorelConnectPowerType.MONTH,
+	SorelConnectPowerType.YEAR,
+	SorelConnectPowerType.TOTAL,
+)
+ENERGY_POWER_TYPES: Final = POWER_TYPES[1:]
+
+
 class SorelConnectEnergyType(StrEnum):
 	DAY = "day"
 	WEEK = "week"
@@ -85,12 +122,23 @@ class SorelConnectEnergyEntity(SorelConnectEntity):
 
 class SorelConnectClient:
 
-	def __init__(self, hass: HomeAssistant, config: Dict[str, Any]) -> None:
+	def __init__(self, hass: HomeAssistant, config: Dict[str, Any], options: Dict[str, Any] | None = None) -> None:
 		self._hass: HomeAssistant = hass
 		self._config: Dict[str, Any] = config
+		self._options: Dict[str, Any] = options if options is not None else {}
 
 		self._session: aiohttp.ClientSession = aiohttp_client.async_get_clientsession(self._hass)
-		self._cookies: SimpleCookie | None = None
+		self._timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=self._options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT))
+		self._auth: SorelConnectAuth = SorelConnectAuth(
+			self._session,
+			self._get_host(),
+			self._config[CONF_EMAIL],
+			self._config[CONF_PASSWORD],
+			self._timeout,
+		)
+		self._semaphore: asyncio.Semaphore = asyncio.Semaphore(self._options.get(CONF_REQUEST_CONCURRENCY, DEFAULT_REQUEST_CONCURRENCY))
+		self._disabled_groups: set = set(self._options.get(CONF_DISABLED_GROUPS, []))
+		self._disabled_channels: set = set(self._options.get(CONF_DISABLED_CHANNELS, []))
 
 		self._store: storage.Store = storage.Store(self._hass, STORAGE_VERSION, DOMAIN)
 		self._stored_data: dict | None = None
@@ -98,37 +146,89 @@ class SorelConnectClient:
 
 		self.entities: Dict[SorelConnectEntityType, Dict[str, SorelConnectEntity]] = {}
 		self._entities_states: Dict[str, StateType] = {}
+		self._channels: Dict[str, Callable[[], Awaitable[None]]] = {}
+		self._channels_groups: Dict[str, SorelConnectChannelGroup] = {}
 
 	async def login(self) -> None:
-		if self._cookies is not None:
-			return
+		await self._auth.ensure_session()
 
-		response = await self._request(self._get_login_url())
-		data = await response.text()
-		json = json_load(data.strip('()'))
+	async def initialize(self) -> None:
+		await self._load_stored_data()
 
-		if "session_key" not in json:
-			raise InvalidCredentials
+		await self.login()
 
-		self._cookies = response.cookies
+		if SorelConnectChannelGroup.SENSORS not in self._disabled_groups:
+			await self._detect_and_create_sensors()
 
-	async def initialize(self) -> None:
-		await self._load_stored_data()
+		if (
+			SorelConnectChannelGroup.POWER not in self._disabled_groups
+			or SorelConnectChannelGroup.ENERGY not in self._disabled_groups
+		):
+			await self._detect_and_create_power_and_energy_sensors()
 
+		if SorelConnectChannelGroup.RELAYS not in self._disabled_groups:
+			await self._detect_and_create_relays()
+
+	@property
+	def channel_ids(self) -> List[str]:
+		return list(self._channels.keys())
+
+	async def update_data(self, channel_ids: Iterable[str] | None = None) -> Dict[str, StateType]:
 		await self.login()
-		await self._detect_and_create_sensors()
-		await self._detect_and_create_power_and_energy_sensors()
-		await self._detect_and_create_relays()
 
-	async def update_data(self) -> Dict[str, StateType]:
+		await self._update_channels(channel_ids if channel_ids is not None else self._channels.keys())
+
+		return self._entities_states
+
+	async def update_energy_data(self) -> Dict[str, StateType]:
 		await self.login()
 
-		await self._update_sensors_states()
-		await self._update_power_and_energy_sensors_states()
-		await self._update_relays_states()
+		await self._update_channels([channel_id for channel_id, group in self._channels_groups.items() if group == SorelConnectChannelGroup.ENERGY])
 
 		return self._entities_states
 
+	@classmethod
+	def get_all_channels(cls) -> Dict[str, str]:
+		channels = {}
+
+		for sensor_id in range(1, MAX_SENSORS + 1):
+			channels[cls.get_entity_sensor_id(sensor_id)] = cls._get_entity_sensor_name(sensor_id)
+
+		channels[cls._get_entity_power_sensor_id(SorelConnectPowerType.ACTUAL)] = cls._get_entity_power_sensor_name()
+
+		for power_type in ENERGY_POWER_TYPES:
+			energy_type = cls._get_entity_energy_type_from_power_type(power_type)
+			channels[cls._get_entity_energy_sensor_id(energy_type)] = cls._get_entity_energy_sensor_name(energy_type)
+
+		for relay_id in range(1, MAX_RELAYS + 1):
+			channels[cls._get_entity_relay_id(relay_id)] = cls._get_entity_relay_name(relay_id)
+
+		return channels
+
+	def _is_channel_enabled(self, group: SorelConnectChannelGroup, channel_id: str) -> bool:
+		return group not in self._disabled_groups and channel_id not in self._disabled_channels
+
+	def _register_channel(self, group: SorelConnectChannelGroup, channel_id: str, update: Callable[[], Awaitable[None]]) -> None:
+		self._channels[channel_id] = update
+		self._channels_groups[channel_id] = group
+
+	async def _update_channels(self, channel_ids: Iterable[str]) -> None:
+		tasks = [asyncio.create_task(self._update_channel(channel_id)) for channel_id in channel_ids]
+
+		try:
+			await asyncio.gather(*tasks)
+		except BaseException:
+			# Stop the other channels like the sequential polling did, the refresh has failed anyway
+			for task in tasks:
+				task.cancel()
+
+			await asyncio.gather(*tasks, return_exceptions=True)
+			raise
+
+	async def _update_channel(self, channel_id: str) -> None:
+		async with self._semaphore:
+			await self._channels[channel_id]()
+
 	async def _load_stored_data(self) -> None:
 		self._stored_data = await self._store.async_load()
 
@@ -149,6 +249,9 @@ class SorelConnectClient:
 
 	async def _detect_and_create_relays(self) -> None:
 		for relay_id in range(1, MAX_RELAYS + 1):
+			if not self._is_channel_enabled(SorelConnectChannelGroup.RELAYS, self._get_entity_relay_id(relay_id)):
+				continue
+
 			relay_raw_value = await self._get_relay_raw_value(relay_id)
 			if relay_raw_value is None:
 				continue
@@ -164,20 +267,20 @@ class SorelConnectClient:
 				self._get_entity_relay_name(relay_id),
 				self._get_entity_value_from_relay_value(relay_id, relay_raw_value),
 			)
+			self._register_channel(SorelConnectChannelGroup.RELAYS, self._get_entity_relay_id(relay_id), partial(self._update_relay_state, relay_id))
 
-	async def _update_relays_states(self) -> None:
-		for relay_id in range(1, MAX_RELAYS + 1):
-			relay_raw_value = await self._get_relay_raw_value(relay_id)
+	async def _update_relay_state(self, relay_id: int) -> None:
+		relay_raw_value = await self._get_relay_raw_value(relay_id)
 
-			if relay_raw_value is None:
-				continue
+		if relay_raw_value is None:
+			return
 
-			self._entities_states[self._get_entity_relay_id(relay_id)] = self._get_entity_value_from_relay_value(relay_id, relay_raw_value)
+		self._entities_states[self._get_entity_relay_id(relay_id)] = self._get_entity_value_from_relay_value(relay_id, relay_raw_value)
 
 	async def _get_relay_raw_value(self, relay_id: int) -> StateType:
-		response = await self._logged_request(self._get_relay_url(relay_id))
+		data = await self._logged_request(self._get_relay_url(relay_id))
 
-		return await self._get_value_from_response(response)
+		return self._get_value_from_data(data)
 
 	@staticmethod
 	def _detect_entity_type_from_relay_value(relay_id: int, relay_raw_value: str) -> SorelConnectEntityType | None:
@@ -208,16 +311,21 @@ class SorelConnectClient:
 
 		self._sensors_count = 0
 		for sensor_id in range(1, sensors_to_check + 1):
+			if not self._is_channel_enabled(SorelConnectChannelGroup.SENSORS, self.get_entity_sensor_id(sensor_id)):
+				self._sensors_count += 1
+				continue
+
 			sensor_value = await self._get_sensor_value(sensor_id)
 			if sensor_value is None:
 				break
 
 			self._create_entity(
 				SorelConnectEntityType.TEMPERATURE,
-				self._get_entity_sensor_id(sensor_id),
+				self.get_entity_sensor_id(sensor_id),
 				self._get_entity_sensor_name(sensor_id),
 				sensor_value
 			)
+			self._register_channel(SorelConnectChannelGroup.SENSORS, self.get_entity_sensor_id(sensor_id), partial(self._update_sensor_state, sensor_id))
 			self._sensors_count += 1
 
 		if self._config[CONF_ID] not in self._stored_data:
@@ -230,7 +338,7 @@ class SorelConnectClient:
 		if SorelConnectEntityType.TEMPERATURE not in self.entities:
 			self.entities[SorelConnectEntityType.TEMPERATURE] = {}
 
-		entity_sensor_id = self._get_entity_sensor_id(sensor_id)
+		entity_sensor_id = self.get_entity_sensor_id(sensor_id)
 		self.entities[SorelConnectEntityType.TEMPERATURE][entity_sensor_id] = SorelConnectEntity(
 			"{}.{}".format(self._config[CONF_ID], entity_sensor_id),
 			SorelConnectEntityType.TEMPERATURE,
@@ -240,13 +348,12 @@ class SorelConnectClient:
 
 		self._entities_states[entity_sensor_id] = sensor_value
 
-	async def _update_sensors_states(self) -> None:
-		for sensor_id in range(1, self._sensors_count + 1):
-			self._entities_states[self._get_entity_sensor_id(sensor_id)] = await self._get_sensor_value(sensor_id)
+	async def _update_sensor_state(self, sensor_id: int) -> None:
+		self._entities_states[self.get_entity_sensor_id(sensor_id)] = await self._get_sensor_value(sensor_id)
 
 	async def _get_sensor_value(self, sensor_id: int) -> StateType:
-		response = await self._logged_request(self._get_sensor_url(sensor_id))
-		value = await self._get_value_from_response(response)
+		data = await self._logged_request(self._get_sensor_url(sensor_id))
+		value = self._get_value_from_data(data)
 
 		if value is None:
 			return None
@@ -256,7 +363,10 @@ class SorelConnectClient:
 		return float(match.group(1))
 
 	async def _detect_and_create_power_and_energy_sensors(self) -> None:
-		for power_type in (SorelConnectPowerType.ACTUAL, SorelConnectPowerType.DAY, SorelConnectPowerType.WEEK, SorelConnectPowerType.MONTH, SorelConnectPowerType.YEAR, SorelConnectPowerType.TOTAL):
+		for power_type in POWER_TYPES:
+			if not self._is_channel_enabled(self._get_power_type_group(power_type), self._get_power_type_entity_id(power_type)):
+				continue
+
 			power_sensor_raw_value = await self._get_power_sensor_raw_value(power_type.value)
 			if power_sensor_raw_value is None:
 				break
@@ -278,26 +388,24 @@ class SorelConnectClient:
 					self._get_entity_value_from_energy_sensor_raw_value(power_type, power_sensor_raw_value),
 				)
 
-	async def _update_power_and_energy_sensors_states(self) -> None:
-		for power_type in (SorelConnectPowerType.ACTUAL, SorelConnectPowerType.DAY, SorelConnectPowerType.WEEK, SorelConnectPowerType.MONTH, SorelConnectPowerType.YEAR, SorelConnectPowerType.TOTAL):
-			power_sensor_raw_value = await self._get_power_sensor_raw_value(power_type.value)
-			if power_sensor_raw_value is None:
-				continue
+			self._register_channel(self._get_power_type_group(power_type), self._get_power_type_entity_id(power_type), partial(self._update_power_sensor_state, power_type))
 
-			if power_type == SorelConnectPowerType.ACTUAL:
-				entity_id = self._get_entity_power_sensor_id(power_type)
-				entity_value = self._get_entity_value_from_power_sensor_raw_value(power_type, power_sensor_raw_value)
-			else:
-				energy_type = self._get_entity_energy_type_from_power_type(power_type)
-				entity_id = self._get_entity_energy_sensor_id(energy_type)
-				entity_value = self._get_entity_value_from_energy_sensor_raw_value(power_type, power_sensor_raw_value)
+	async def _update_power_sensor_state(self, power_type: SorelConnectPowerType) -> None:
+		power_sensor_raw_value = await self._get_power_sensor_raw_value(power_type.value)
+		if power_sensor_raw_value is None:
+			return
+
+		if power_type == SorelConnectPowerType.ACTUAL:
+			entity_value = self._get_entity_value_from_power_sensor_raw_value(power_type, power_sensor_raw_value)
+		else:
+			entity_value = self._get_entity_value_from_energy_sensor_raw_value(power_type, power_sensor_raw_value)
 
-			self._entities_states[entity_id] = entity_value
+		self._entities_states[self._get_power_type_entity_id(power_type)] = entity_value
 
 	async def _get_power_sensor_raw_value(self, sensor_id: int) -> StateType:
-		response = await self._logged_request(self._get_power_sensor_url(sensor_id))
+		data = await self._logged_request(self._get_power_sensor_url(sensor_id))
 
-		return await self._get_value_from_response(response)
+		return self._get_value_from_data(data)
 
 	@staticmethod
 	def _get_entity_value_from_power_sensor_raw_value(power_type: SorelConnectPowerType, power_sensor_raw_value: str) -> StateType | None:
@@ -332,16 +440,13 @@ class SorelConnectClient:
 
 		return value
 
-	@staticmethod
-	async def _get_value_from_response(response: aiohttp.ClientResponse) -> str | None:
-		# The URL returns "text/html" so ignore content_type check
-		data = await response.json(content_type=None)
-
+	def _get_value_from_data(self, data: Any) -> str | None:
 		if (
-			"response" not in data
+			not isinstance(data, dict)
+			or "response" not in data
 			or "val" not in data["response"]
 		):
-			LOGGER.error("Invalid data {}".format(data))
+			LOGGER.error("Invalid data {}".format(self._auth.redact(str(data))))
 			return None
 
 		if data["response"]["val"] == "--":
@@ -381,13 +486,6 @@ class SorelConnectClient:
 	def _get_host(self) -> str:
 		return "{}.sorel-connect.net".format(self._config[CONF_ID])
 
-	def _get_login_url(self) -> str:
-		return "https://{}/nabto/hosted_plugin/login/execute?email={}&password={}".format(
-			self._get_host(),
-			self._config[CONF_EMAIL],
-			self._config[CONF_PASSWORD],
-		)
-
 	def _get_sensor_url(self, sensor_id: int) -> str:
 		return "https://{}/sensors.json?id={}".format(
 			self._get_host(),
@@ -406,26 +504,50 @@ class SorelConnectClient:
 			relay_id,
 		)
 
-	async def _logged_request(self, url: str) -> aiohttp.ClientResponse:
-		response = await self._request(url, self._cookies)
-
-		text = await response.text()
-		if text.strip()[0:1] == "<":
-			self._cookies = None
-			await self.login()
+	async def _logged_request(self, url: str) -> Any:
+		# Captured before the request so a login failing while it is in flight is not retried
+		generation = self._auth.generation
+		attempts = self._auth.attempts
+
+		response = await self._request(url, self._auth.cookies)
+		if not self._auth.is_expired(response):
+			try:
+				return await self._get_json_from_response(response)
+			except ValueError:
+				# Some controllers answer an expired session with the login page and no other hint
+				pass
+		else:
+			# Return the connection to the shared pool, the body is not needed
+			response.release()
+
+		await self._auth.reauthenticate(generation, attempts)
+
+		response = await self._request(url, self._auth.cookies)
+		if self._auth.is_expired(response):
+			response.release()
+			raise ServiceUnavailable
 
-		return await self._request(url, self._cookies)
+		try:
+			return await self._get_json_from_response(response)
+		except ValueError:
+			raise ServiceUnavailable from None
 
 	async def _request(self, url: str, cookies: SimpleCookie | None = None) -> aiohttp.ClientResponse:
-		response = await self._session.get(url, verify_ssl=False, cookies=cookies)
+		response = await self._session.get(url, verify_ssl=False, cookies=cookies, timeout=self._timeout)
 
-		if response.status != HTTPStatus.OK:
+		if response.status != HTTPStatus.OK and response.status not in EXPIRED_SESSION_STATUSES:
+			response.release()
 			raise ServiceUnavailable
 
 		return response
 
 	@staticmethod
-	def _get_entity_sensor_id(sensor_id: int) -> str:
+	async def _get_json_from_response(response: aiohttp.ClientResponse) -> Any:
+		# The URL returns "text/html" so ignore content_type check
+		return await response.json(content_type=None)
+
+	@staticmethod
+	def get_entity_sensor_id(sensor_id: int) -> str:
 		return "sensor_{}".format(sensor_id)
 
 	@staticmethod
@@ -448,6 +570,17 @@ class SorelConnectClient:
 	def _get_entity_energy_sensor_name(energy_type: SorelConnectEnergyType) -> str:
 		return "{} energy".format(energy_type.value[0:1].upper() + energy_type.value[1:])
 
+	@staticmethod
+	def _get_power_type_group(power_type: SorelConnectPowerType) -> SorelConnectChannelGroup:
+		return SorelConnectChannelGroup.POWER if power_type == SorelConnectPowerType.ACTUAL else SorelConnectChannelGroup.ENERGY
+
+	@classmethod
+	def _get_power_type_entity_id(cls, power_type: SorelConnectPowerType) -> str:
+		if power_type == SorelConnectPowerType.ACTUAL:
+			return cls._get_entity_power_sensor_id(power_type)
+
+		return cls._get_entity_energy_sensor_id(cls._get_entity_energy_type_from_power_type(power_type))
+
 	@staticmethod
 	def _get_entity_energy_type_from_power_type(power_type: SorelConnectPowerType) -> SorelConnectEnergyType:
 		if power_type == SorelConnectPowerType.DAY:
@@ -475,19 +608,75 @@ class SorelConnectClient:
 
 class SorelConnectCoordinator(DataUpdateCoordinator):
 
-	def __init__(self, hass: HomeAssistant, client: SorelConnectClient) -> None:
-		super().__init__(hass, LOGGER, name=DOMAIN, update_interval=timedelta(minutes=5), update_method=self.update)
+	def __init__(self, hass: HomeAssistant, client: SorelConnectClient, analytics: SorelConnectAnalytics, update_interval: timedelta, polling: SorelConnectAdaptivePolling | None = None) -> None:
+		super().__init__(hass, LOGGER, name=DOMAIN, update_interval=update_interval, update_method=self.update)
 
 		self._client: SorelConnectClient = client
+		self._analytics: SorelConnectAnalytics = analytics
+		self.polling: SorelConnectAdaptivePolling | None = polling
+
+		self._written_data: Dict[str, StateType] = {}
+		self._written_success: bool | None = None
 
 	async def update(self) -> Dict[str, StateType]:
-		return await self._client.update_data()
+		if self.polling is None:
+			data = await self._client.update_data()
+		else:
+			now = self.hass.loop.time()
+			channel_ids = self.polling.get_due_channels(now)
+
+			data = await self._client.update_data(channel_ids)
+
+			for channel_id in channel_ids:
+				self.polling.record(channel_id, data.get(channel_id), now)
+
+		self._analytics.update(data)
+
+		return self._merge_analytics(data)
+
+	async def async_refresh_energy(self) -> None:
+		try:
+			data = await self._client.update_energy_data()
+		except (SorelConnectException, aiohttp.ClientError, TimeoutError) as ex:
+			LOGGER.debug("Energy refresh failed: {}".format(ex))
+			return
+
+		self.async_set_updated_data(self._merge_analytics(data))
+
+	@callback
+	def async_update_listeners(self) -> None:
+		async_get_state_writer(self.hass).async_schedule(self)
+
+	@callback
+	def async_update_all_listeners(self) -> None:
+		async_get_state_writer(self.hass).async_schedule(self, force=True)
+
+	@callback
+	def async_write_listeners(self, force: bool) -> None:
+		data = self.data if self.data is not None else {}
+
+		changed_ids = None
+		if not force and self.last_update_success == self._written_success:
+			changed_ids = {entity_id for entity_id, value in data.items() if entity_id not in self._written_data or self._written_data[entity_id] != value}
+
+		self._written_data = data
+		self._written_success = self.last_update_success
+
+		# DataUpdateCoordinator has no public way to notify only some listeners, so this relies on
+		# its private _listeners mapping of (update_callback, context) pairs
+		for update_callback, context in list(self._listeners.values()):
+			# Entities use their channel as the context so unchanged ones are not written again
+			if changed_ids is None or context is None or context in changed_ids:
+				update_callback()
+
+	def _merge_analytics(self, data: Dict[str, StateType]) -> Dict[str, StateType]:
+		return {**data, **self._analytics.values}
 
 
 class SorelConnectCoordinatorEntity(CoordinatorEntity):
 
 	def __init__(self, coordinator: DataUpdateCoordinator, entity: SorelConnectEntity) -> None:
-		super().__init__(coordinator)
+		super().__init__(coordinator, context=entity.id)
 
 		self._entity: SorelConnectEntity = entity
 
@@ -0,0 +1,170 @@
+"""Long-term statistics of the SOREL Connect energy channels."""
+from __future__ import annotations
+from datetime import datetime, timedelta
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+	StatisticData,
+	StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+	async_add_external_statistics,
+	get_last_statistics,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import callback, CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_track_utc_time_change
+import homeassistant.util.dt as dt_util
+from homeassistant.util import slugify
+from typing import Dict
+from .const import (
+	DOMAIN,
+	LOGGER,
+	NAME,
+)
+from .periods import (
+	ROLLOVER_REFRESH_DELAY,
+	SorelConnectPeriods,
+)
+from .sorel_connect import (
+	SorelConnectCoordinator,
+	SorelConnectEnergyEntity,
+	SorelConnectEnergyType,
+)
+
+
+class SorelConnectEnergyStatistic:
+
+	def __init__(self, controller_id: str, entity: SorelConnectEnergyEntity, periods: SorelConnectPeriods) -> None:
+		self.entity_id: str = entity.id
+		self._energy_type: SorelConnectEnergyType = entity.energy_type
+		self._periods: SorelConnectPeriods = periods
+		self.metadata: StatisticMetaData = StatisticMetaData(
+			has_mean=False,
+			has_sum=True,
+			name="{} {} {}".format(NAME, controller_id, entity.name),
+			source=DOMAIN,
+			statistic_id="{}:{}".format(DOMAIN, slugify("{}_{}".format(controller_id, entity.id))),
+			unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+		)
+
+		self.last_value: float | None = None
+		self.sum: float = 0.0
+
+		self._last_reset: datetime | None = self._periods.get_last_reset(self._energy_type)
+		# A period boundary has passed and the controller has not reset the counter yet
+		self._reset_pending: bool = False
+
+	def restore(self, value: float, total: float, start: datetime) -> None:
+		self.last_value = value
+		self.sum = total
+
+		if self._last_reset is not None and start + timedelta(hours=1) <= self._last_reset:
+			self._reset_pending = True
+
+	def add(self, value: float, updated: datetime | None) -> None:
+		last_reset = self._periods.get_last_reset(self._energy_type)
+		if last_reset != self._last_reset:
+			self._last_reset = last_reset
+			self._reset_pending = True
+
+		# Data refreshed after the controller reset its counters shows the new period, so a counter
+		# that does not drop now was already low and no later drop may be taken as the reset
+		refreshed_after_reset = (
+			self._last_reset is not None
+			and updated is not None
+			and updated >= self._last_reset + ROLLOVER_REFRESH_DELAY
+		)
+
+		if self.last_value is None:
+			self.last_value = value
+
+			if refreshed_after_reset:
+				self._reset_pending = False
+
+			return
+
+		if value >= self.last_value:
+			self.sum += value - self.last_value
+			self.last_value = value
+
+			if refreshed_after_reset:
+				self._reset_pending = False
+
+			return
+
+		# The total counter never resets and other counters only after a period boundary,
+		# so any other drop is a glitch and the counter has to get over the last value again
+		if self._reset_pending:
+			self.sum += value
+			self.last_value = value
+			self._reset_pending = False
+
+
+class SorelConnectEnergyStatistics:
+
+	def __init__(self, hass: HomeAssistant, coordinator: SorelConnectCoordinator, periods: SorelConnectPeriods, controller_id: str, entities: Dict[str, SorelConnectEnergyEntity]) -> None:
+		self._hass: HomeAssistant = hass
+		self._coordinator: SorelConnectCoordinator = coordinator
+
+		self._statistics: Dict[str, SorelConnectEnergyStatistic] = {
+			entity.id: SorelConnectEnergyStatistic(controller_id, entity, periods) for entity in entities.values()
+		}
+		self._unsub_hour: CALLBACK_TYPE | None = None
+		self._unsub_update: CALLBACK_TYPE | None = None
+		self._updated: datetime | None = None
+
+	async def async_start(self) -> None:
+		for statistic in self._statistics.values():
+			last_statistics = await get_instance(self._hass).async_add_executor_job(
+				get_last_statistics, self._hass, 1, statistic.metadata["statistic_id"], True, {"state", "sum"}
+			)
+
+			if statistic.metadata["statistic_id"] not in last_statistics:
+				continue
+
+			last_statistic = last_statistics[statistic.metadata["statistic_id"]][0]
+			statistic.restore(
+				last_statistic["state"],
+				last_statistic["sum"] or 0.0,
+				dt_util.utc_from_timestamp(last_statistic["start"]),
+			)
+
+		self._unsub_hour = async_track_utc_time_change(self._hass, self._handle_hour, minute=0, second=0)
+		self._unsub_update = self._coordinator.async_add_listener(self._handle_update)
+
+	@callback
+	def async_stop(self) -> None:
+		if self._unsub_hour is not None:
+			self._unsub_hour()
+			self._unsub_hour = None
+
+		if self._unsub_update is not None:
+			self._unsub_update()
+			self._unsub_update = None
+
+	@callback
+	def _handle_update(self) -> None:
+		if self._coordinator.last_update_success:
+			self._updated = dt_util.utcnow()
+
+	@callback
+	def _handle_hour(self, now: datetime) -> None:
+		if not self._coordinator.last_update_success or self._coordinator.data is None:
+			LOGGER.debug("Skipping energy statistics of the hour before {}".format(now))
+			return
+
+		start = dt_util.as_utc(now).replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+
+		for entity_id, statistic in self._statistics.items():
+			value = self._coordinator.data.get(entity_id)
+
+			if value is None:
+				continue
+
+			statistic.add(value, self._updated)
+
+			async_add_external_statistics(
+				self._hass,
+				statistic.metadata,
+				[StatisticData(start=start, state=value, sum=statistic.sum)],
+			)